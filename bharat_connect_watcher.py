@@ -15,7 +15,12 @@ from datetime import datetime, timezone
 from urllib.parse import urlparse, unquote
 
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ================= CONFIG =================
 
@@ -75,7 +80,11 @@ async def fetch_html():
 
         # ✅ CORRECT LOAD STRATEGY
         await page.goto(SOURCE_URL, wait_until="domcontentloaded", timeout=60000)
-        await page.wait_for_timeout(5000)  # allow JS + SSR hydration
+        # Wait for the circular list itself instead of a fixed 5s hydration pause
+        try:
+            await page.locator("li.js-listItem").first.wait_for(state="attached", timeout=15000)
+        except PlaywrightTimeoutError:
+            print("[WARN] Circular list did not render within 15s")
 
         html = await page.content()
 
@@ -146,8 +155,11 @@ def main():
 
     if new_entries:
         append_to_csv(new_entries)
-        with open(NEW_JSON, "w", encoding="utf-8") as f:
-            json.dump(new_entries, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            NEW_JSON.write_bytes(orjson.dumps(new_entries, option=orjson.OPT_INDENT_2))
+        else:
+            with open(NEW_JSON, "w", encoding="utf-8") as f:
+                json.dump(new_entries, f, ensure_ascii=False, indent=2)
     else:
         print("[INFO] No new entries found")
 
@@ -0,0 +1,24 @@
+"""
+Chromium launch flags shared by the Playwright scrapers.
+
+Each scraper still runs in its own workflow job and launches its own
+browser; only the flags live here.
+"""
+
+# Scraping-tuned Chromium flags (lower RSS, faster startup)
+LAUNCH_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--disable-translate",
+    "--mute-audio",
+    "--blink-settings=imagesEnabled=false",
+    "--disable-features=IsolateOrigins,site-per-process,TranslateUI",
+    "--js-flags=--max-old-space-size=256",
+    "--disable-blink-features=AutomationControlled",
+]
+IGNORE_DEFAULT_ARGS = ["--enable-automation"]
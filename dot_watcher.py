@@ -54,6 +54,10 @@ def build_session():
 SESSION = build_session()
 
 # ---------- date helpers ----------
+_DATE_JUNK_RE = re.compile(r"[,\u00A0]+")
+_DIGITS_RE = re.compile(r"\d+")
+_NON_DIGIT_RE = re.compile(r"[^\d]")
+
 def normalize_date_mmddyyyy(date_text: str) -> str:
     """
     Try to parse a variety of date strings and return as mm/dd/yyyy.
@@ -67,7 +71,7 @@ def normalize_date_mmddyyyy(date_text: str) -> str:
     ]
     s = date_text.strip()
     # Common fix: sometimes has extra spaces or commas
-    s = re.sub(r"[,\u00A0]+", " ", s).strip()
+    s = _DATE_JUNK_RE.sub(" ", s).strip()
     for fmt in candidates:
         try:
             dt = datetime.strptime(s, fmt)
@@ -75,7 +79,7 @@ def normalize_date_mmddyyyy(date_text: str) -> str:
         except ValueError:
             continue
     # Fallback: try to extract digits and guess dd/mm/yyyy vs yyyy-mm-dd
-    digits = re.findall(r"\d+", s)
+    digits = _DIGITS_RE.findall(s)
     # Try YYYY MM DD
     if len(digits) >= 3 and len(digits[0]) == 4:
         try:
@@ -125,6 +129,9 @@ def scrape_all_rows():
     return rows
 
 # ---------- filename helpers ----------
+_WS_RE = re.compile(r"\s+")
+_UNSAFE_NAME_RE = re.compile(r"[^A-Za-z0-9\-_\. ]+")
+
 def filename_from_url(url: str) -> str:
     if not url:
         return ""
@@ -138,8 +145,8 @@ def filename_from_url(url: str) -> str:
 def sanitize_name(name: str, max_len: int = 120) -> str:
     if not name:
         return ""
-    s = re.sub(r"\s+", " ", name).strip()
-    s = re.sub(r"[^A-Za-z0-9\-_\. ]+", "", s)
+    s = _WS_RE.sub(" ", name).strip()
+    s = _UNSAFE_NAME_RE.sub("", s)
     s = s.replace(" ", "_")
     if len(s) > max_len:
         s = s[:max_len]
@@ -176,7 +183,7 @@ def make_pdf_filename(item: dict, existing_names: set[str]) -> str:
             dt = datetime.strptime(date_text, "%m/%d/%Y")
             date_compact = dt.strftime("%Y%m%d")
         except Exception:
-            date_compact = re.sub(r"[^\d]", "", date_text)[:8]
+            date_compact = _NON_DIGIT_RE.sub("", date_text)[:8]
         parts = [title]
         if date_compact:
             parts.append(date_compact)
@@ -251,16 +258,17 @@ def load_seen_ids_and_names_and_next_id():
 
 def append_to_master(new_rows_with_names_and_ids):
     mp = Path(MASTER_CSV)
-    with mp.open("a", encoding="utf-8", newline="") as f:
-        w = csv.writer(f)
-        for r in new_rows_with_names_and_ids:
-            w.writerow([
+    with mp.open("a", encoding="utf-8", newline="", buffering=1 << 16) as f:
+        csv.writer(f).writerows(
+            [
                 r.get("id", ""),
                 r.get("title", ""),
                 r.get("publish_date", ""),
                 r.get("pdf_url", ""),
                 r.get("pdf_filename", "")
-            ])
+            ]
+            for r in new_rows_with_names_and_ids
+        )
     print(f"Appended {len(new_rows_with_names_and_ids)} rows to {mp}")
 
 # ---------- JSON writing ----------
@@ -13,15 +13,21 @@ Author: Bhanu Tak
 """
 
 # ===================== IMPORTS =====================
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from chromium_flags import IGNORE_DEFAULT_ARGS, LAUNCH_ARGS
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 import hashlib
 import csv
 import json
 import logging
 from urllib.parse import urlparse, parse_qs
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ===================== CONFIG =====================
 BASE_URL = "https://www.inspace.gov.in"
 
@@ -38,6 +44,34 @@ NEW_JSON   = DATA_DIR / "inspace_new_entries.json"
 
 MAX_PRESS_ITEMS = 10
 
+# One evaluate_all per list instead of several Playwright calls per row
+PRESS_CARDS_JS = """
+cards => cards.map(card => {
+    const text = sel => (card.querySelector(sel)?.innerText || "").trim();
+    const pdf = Array.from(card.querySelectorAll("a")).find(
+        a => a.textContent.replace(/\\s+/g, " ").toLowerCase().includes("download pdf")
+    );
+    return {
+        title: text("h3.release-title"),
+        date: text(".release-date"),
+        href: pdf ? pdf.getAttribute("href") : null,
+    };
+})
+"""
+
+PUBLICATION_DOCS_JS = """
+docs => docs.map(doc => {
+    const link = doc.querySelector("a.doc-link");
+    const meta = doc.querySelector("p.belowlinetext");
+    return {
+        has_link: !!link,
+        title: link ? link.innerText.trim() : "",
+        href: link ? link.getAttribute("href") : null,
+        meta: meta ? meta.innerText.trim() : "",
+    };
+})
+"""
+
 # ===================== LOGGING =====================
 logging.basicConfig(
     level=logging.INFO,
@@ -45,8 +79,15 @@ logging.basicConfig(
 )
 
 # ===================== HELPERS =====================
+def utc_now_naive() -> str:
+    # Same naive-UTC format the old utcnow() produced, without the deprecated call
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+# Ids stay SHA1: existing master rows are deduped by them
+_sha1 = hashlib.sha1
+
 def make_id(text: str) -> str:
-    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+    return _sha1(text.encode("utf-8")).hexdigest()
 
 def extract_pdf_filename(url: str | None) -> str:
     if not url:
@@ -67,8 +108,11 @@ def load_existing_ids():
     ids = set()
     if MASTER_CSV.exists():
         with open(MASTER_CSV, newline="", encoding="utf-8") as f:
-            for row in csv.DictReader(f):
-                ids.add(row["id"])
+            r = csv.reader(f)
+            header = next(r, None)
+            if header and "id" in header:
+                idx = header.index("id")
+                ids = {row[idx] for row in r if len(row) > idx}
     logging.info(f"Loaded {len(ids)} existing records")
     return ids
 
@@ -80,29 +124,33 @@ def write_master(rows):
             writer.writeheader()
         writer.writerows(rows)
 
+def write_new_json(rows):
+    if orjson is not None:
+        NEW_JSON.write_bytes(orjson.dumps(rows, option=orjson.OPT_INDENT_2))
+    else:
+        NEW_JSON.write_text(json.dumps(rows, indent=2, ensure_ascii=False), encoding="utf-8")
+
 # ===================== PRESS RELEASES =====================
 def scrape_press_releases(page, url):
     logging.info("Scraping Press Releases")
 
     page.goto(url, wait_until="networkidle", timeout=45000)
-    page.wait_for_selector(".releases-list", timeout=30000)
+    page.locator(".releases-list").first.wait_for(timeout=30000)
 
     cards = page.locator(".releases-list .release-item")
-    count = min(cards.count(), MAX_PRESS_ITEMS)
+    rows = cards.evaluate_all(PRESS_CARDS_JS)[:MAX_PRESS_ITEMS]
 
     items = []
+    scraped_at = utc_now_naive()
 
-    for i in range(count):
-        card = cards.nth(i)
-
-        title = card.locator("h3.release-title").inner_text().strip()
-        date  = card.locator(".release-date").inner_text().strip()
+    for row in rows:
+        title = row["title"]
+        date  = row["date"]
 
         pdf_link = ""
-        if card.locator("a:has-text('Download PDF')").count() > 0:
-            href = card.locator("a:has-text('Download PDF')").get_attribute("href")
-            if href:
-                pdf_link = BASE_URL + href if href.startswith("/") else href
+        href = row["href"]
+        if href:
+            pdf_link = BASE_URL + href if href.startswith("/") else href
 
         pdf_filename = extract_pdf_filename(pdf_link)
 
@@ -118,7 +166,7 @@ def scrape_press_releases(page, url):
             "pdf_link": pdf_link,
             "pdf_filename": pdf_filename,
             "source_page": url,
-            "scraped_at": datetime.utcnow().isoformat()
+            "scraped_at": scraped_at
         })
 
     logging.info(f"Found {len(items)} items in Press Releases")
@@ -129,9 +177,10 @@ def scrape_publications(page, url):
     logging.info("Scraping Publications")
 
     page.goto(url, wait_until="networkidle", timeout=45000)
-    page.wait_for_selector(".publications-container", timeout=30000)
+    page.locator(".publications-container").first.wait_for(timeout=30000)
 
     all_items = []
+    scraped_at = utc_now_naive()
 
     categories = page.locator(".category-block")
     logging.info(f"Detected {categories.count()} publication categories")
@@ -142,23 +191,28 @@ def scrape_publications(page, url):
         category_title = header.locator("h4").inner_text().strip()
 
         header.click(force=True)
-        page.wait_for_timeout(500)
 
-        docs = category.locator("ul.doc-list li")
+        # Wait for the opened accordion's rows to render instead of a fixed
+        # pause; innerText of hidden rows is not whitespace-collapsed
+        try:
+            category.locator("ul.doc-list li").first.wait_for(timeout=5000)
+        except PlaywrightTimeoutError:
+            logging.warning(f"No document list under category: {category_title}")
+            continue
+
+        docs = category.locator("ul.doc-list li").evaluate_all(PUBLICATION_DOCS_JS)
 
-        for j in range(docs.count()):
-            doc = docs.nth(j)
+        for doc in docs:
+            if not doc["has_link"]:
+                continue
 
-            link = doc.locator("a.doc-link")
-            title = link.inner_text().strip()
-            href = link.get_attribute("href")
+            title = doc["title"]
+            href = doc["href"]
 
             if href:
                 href = BASE_URL + href if href.startswith("/") else href
 
-            meta = ""
-            if doc.locator("p.belowlinetext").count() > 0:
-                meta = doc.locator("p.belowlinetext").inner_text().strip()
+            meta = doc["meta"]
 
             pdf_filename = extract_pdf_filename(href)
 
@@ -174,7 +228,7 @@ def scrape_publications(page, url):
                 "pdf_link": href,
                 "pdf_filename": pdf_filename,
                 "source_page": url,
-                "scraped_at": datetime.utcnow().isoformat()
+                "scraped_at": scraped_at
             })
 
     logging.info(f"Total publications collected: {len(all_items)}")
@@ -189,7 +243,8 @@ def main():
         browser = p.chromium.launch(
             channel="chrome",
             headless=True,
-            args=["--no-sandbox", "--disable-dev-shm-usage"]
+            args=LAUNCH_ARGS,
+            ignore_default_args=IGNORE_DEFAULT_ARGS,
         )
         page = browser.new_page()
 
@@ -207,7 +262,7 @@ def main():
 
     if new_entries:
         write_master(new_entries)
-        NEW_JSON.write_text(json.dumps(new_entries, indent=2, ensure_ascii=False), encoding="utf-8")
+        write_new_json(new_entries)
         logging.info(f"✅ {len(new_entries)} new entries saved")
     else:
         NEW_JSON.write_text("[]", encoding="utf-8")
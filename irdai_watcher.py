@@ -45,6 +45,10 @@ HEADERS = {
     )
 }
 
+# Category pages share one keep-alive connection
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+
 TOP_N = 10
 
 # =========================================
@@ -64,7 +68,7 @@ def fetch_page(url):
         "_com_irdai_document_media_IRDAIDocumentMediaPortlet_delta": "20",
         "_com_irdai_document_media_IRDAIDocumentMediaPortlet_cur": "1",
     }
-    r = requests.get(url, headers=HEADERS, params=params, timeout=30)
+    r = _SESSION.get(url, params=params, timeout=30)
     r.raise_for_status()
     return r.text
 
@@ -1,11 +1,19 @@
 from playwright.sync_api import sync_playwright
 from bs4 import BeautifulSoup
-import pandas as pd
+import csv
 import json
+import logging
 from urllib.parse import urljoin
 from pathlib import Path
 import hashlib
 
+from chromium_flags import IGNORE_DEFAULT_ARGS, LAUNCH_ARGS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ---------------- CONFIG ----------------
 BASE_URL = "https://www.isro.gov.in"
 PRESS_URL = "https://www.isro.gov.in/Press.html"
@@ -18,34 +26,60 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 MASTER_CSV = DATA_DIR / "isro_master.csv"
 NEW_JSON = DATA_DIR / "isro_new_entries.json"
 
+FIELDNAMES = ["id", "title", "page_link", "page_content", "date"]
+
+# Only the HTML is parsed; abort everything else at the network layer
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+
 # ---------------- HELPERS ----------------
 def generate_id(value: str) -> str:
     return hashlib.sha1(value.encode("utf-8")).hexdigest()
 
+def block_heavy_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
 # ---------------- LOAD MASTER CSV ----------------
+# Only the page_link column is needed for dedupe
+existing_links = set()
 if MASTER_CSV.exists():
-    master_df = pd.read_csv(MASTER_CSV)
-    existing_links = set(master_df["page_link"].astype(str))
-else:
-    master_df = pd.DataFrame(
-        columns=["id", "title", "page_link", "page_content", "date"]
-    )
-    existing_links = set()
+    with open(MASTER_CSV, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header and "page_link" in header:
+            idx = header.index("page_link")
+            existing_links = {row[idx] for row in reader if len(row) > idx}
 
-print(f"[+] Loaded {len(existing_links)} existing records")
+logging.info("Loaded %d existing records", len(existing_links))
 
 new_entries = []
 
 # ---------------- SCRAPER ----------------
 with sync_playwright() as p:
-    browser = p.chromium.launch(headless=True)
-    page = browser.new_page()
+    browser = p.chromium.launch(
+        headless=True,
+        args=LAUNCH_ARGS,
+        ignore_default_args=IGNORE_DEFAULT_ARGS,
+    )
+    context = browser.new_context()
+    context.route("**/*", block_heavy_resources)
+    page = context.new_page()
 
     page.goto(PRESS_URL, wait_until="domcontentloaded", timeout=60000)
     soup = BeautifulSoup(page.content(), "html.parser")
 
     rows = soup.select("table tbody tr")[:MAX_ENTRIES_TO_CHECK]
 
+    # One detail page reused for every entry (no new target per link)
+    detail = context.new_page()
+
     for row in rows:
         link_tag = row.select_one("a")
         if not link_tag:
@@ -61,19 +95,16 @@ with sync_playwright() as p:
         if page_link in existing_links:
             continue
 
-        print(f"[+] New press: {title}")
+        logging.info("New press: %s", title)
 
         # ---- Open detail page ----
-        detail = browser.new_page()
         try:
             detail.goto(page_link, wait_until="domcontentloaded", timeout=30000)
         except Exception:
-            print(f"[!] Skipped (slow/broken): {page_link}")
-            detail.close()
+            logging.warning("Skipped (slow/broken): %s", page_link)
             continue
 
         detail_soup = BeautifulSoup(detail.content(), "html.parser")
-        detail.close()
 
         # ---- CORRECT CONTENT EXTRACTION (ISRO-specific) ----
         content_blocks = detail_soup.select("p.pageContent")
@@ -93,16 +124,25 @@ with sync_playwright() as p:
         }
 
         new_entries.append(record)
-        master_df.loc[len(master_df)] = record
 
     browser.close()
 
 # ---------------- WRITE OUTPUTS ----------------
-master_df.to_csv(MASTER_CSV, index=False)
-
-with open(NEW_JSON, "w", encoding="utf-8") as f:
-    json.dump(new_entries, f, indent=2, ensure_ascii=False)
+# Append only the new rows; history is never rewritten
+if new_entries:
+    write_header = not MASTER_CSV.exists()
+    with open(MASTER_CSV, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES, lineterminator="\n")
+        if write_header:
+            writer.writeheader()
+        writer.writerows(new_entries)
+
+if orjson is not None:
+    NEW_JSON.write_bytes(orjson.dumps(new_entries, option=orjson.OPT_INDENT_2))
+else:
+    with open(NEW_JSON, "w", encoding="utf-8") as f:
+        json.dump(new_entries, f, indent=2, ensure_ascii=False)
 
-print(f"[✓] New entries found: {len(new_entries)}")
-print(f"[✓] Master CSV updated: {MASTER_CSV}")
-print(f"[✓] New entries JSON written: {NEW_JSON}")
+logging.info("New entries found: %d", len(new_entries))
+logging.info("Master CSV updated: %s", MASTER_CSV)
+logging.info("New entries JSON written: %s", NEW_JSON)
@@ -47,6 +47,10 @@ HEADERS = {
     )
 }
 
+# The three category pages share one keep-alive connection
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+
 CSV_FIELDS = [
     "id",
     "date",
@@ -67,15 +71,19 @@ def make_id(title, date, category, link):
     raw = f"{title}|{date}|{category}|{link}"
     return hashlib.sha1(raw.encode("utf-8")).hexdigest()
 
+_DATE_SEP_RE = re.compile(r"[./-]")
+_SLUG_DROP_RE = re.compile(r"[^\w\s-]")
+_WS_RE = re.compile(r"\s+")
+
 def normalize_date(date_str):
-    parts = re.split(r"[./-]", date_str)
+    parts = _DATE_SEP_RE.split(date_str)
     if len(parts) == 3:
         return f"{parts[2]}-{parts[1].zfill(2)}-{parts[0].zfill(2)}"
     return date_str or "unknown-date"
 
 def make_pdf_filename(title, date):
-    slug = re.sub(r"[^\w\s-]", "", title.lower())
-    slug = re.sub(r"\s+", "-", slug).strip("-")[:80]
+    slug = _SLUG_DROP_RE.sub("", title.lower())
+    slug = _WS_RE.sub("-", slug).strip("-")[:80]
     return f"{normalize_date(date)}_{slug}.pdf"
 
 def ensure_master_csv():
@@ -139,7 +147,7 @@ def parse_table_row(row, category, base_url):
 # SCRAPER
 # -------------------------------------------------
 def scrape_category(category, url):
-    res = requests.get(url, headers=HEADERS, timeout=30)
+    res = _SESSION.get(url, timeout=30)
     res.raise_for_status()
 
     soup = BeautifulSoup(res.text, "html.parser")
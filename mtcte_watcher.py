@@ -1,14 +1,21 @@
 import csv
 import json
 import logging
-import re
 import os
+import re
 from datetime import datetime, timezone
 from urllib.parse import urljoin, urlparse, parse_qs
 
 from playwright.sync_api import sync_playwright
 from bs4 import BeautifulSoup
 
+from chromium_flags import IGNORE_DEFAULT_ARGS, LAUNCH_ARGS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ================= CONFIG =================
 
 BASE_URL = "https://www.mtcte.tec.gov.in/"
@@ -32,15 +39,14 @@ def ensure_dirs():
 def now_iso():
     return datetime.now(timezone.utc).isoformat()
 
+_SLUG_RE = re.compile(r"[^a-z0-9\s]")
+
 def slugify_title(title, max_words=8, max_chars=80):
     """
     Convert title into filesystem-safe slug
     """
-    # Lowercase
-    title = title.lower()
-
-    # Remove non-alphanumeric (keep spaces)
-    title = re.sub(r"[^a-z0-9\s]", "", title)
+    # Lowercase + remove non-alphanumeric (keep spaces)
+    title = _SLUG_RE.sub("", title.lower())
 
     # Collapse spaces
     words = title.split()
@@ -70,7 +76,12 @@ def load_existing_ids():
         return set()
 
     with open(MASTER_CSV, newline="", encoding="utf-8") as f:
-        return {row["id"] for row in csv.DictReader(f)}
+        r = csv.reader(f)
+        header = next(r, None)
+        if not header or "id" not in header:
+            return set()
+        idx = header.index("id")
+        return {row[idx] for row in r if len(row) > idx}
 
 # ================= SCRAPER =================
 
@@ -79,14 +90,18 @@ def fetch_whats_new():
     items = []
 
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+        browser = p.chromium.launch(
+            headless=True,
+            args=LAUNCH_ARGS,
+            ignore_default_args=IGNORE_DEFAULT_ARGS,
+        )
         page = browser.new_page()
 
         logging.info("Opening MTCTE homepage")
         page.goto(BASE_URL, wait_until="networkidle", timeout=60000)
 
         # Wait explicitly for the marquee
-        page.wait_for_selector("#marquee1", timeout=30000)
+        page.locator("#marquee1").first.wait_for(timeout=30000)
 
         html = page.content()
         browser.close()
@@ -95,6 +110,7 @@ def fetch_whats_new():
 
     links = soup.select("#marquee1 ul#myNewsList li a")
     logging.info("Found %d items in What's New card", len(links))
+    scraped_at = now_iso()
 
     for a in links:
         item_id = a.get("id", "").strip()
@@ -112,7 +128,7 @@ def fetch_whats_new():
             "pdf_link": pdf_link,
             "pdf_filename": generate_pdf_filename(item_id, title),
             "source_page": BASE_URL,
-            "scraped_at": now_iso(),
+            "scraped_at": scraped_at,
         })
 
     return items
@@ -141,7 +157,11 @@ def append_to_master(rows):
         writer.writerows(rows)
 
 def write_new_entries(rows):
-    with open(NEW_JSON, "w", encoding="utf-8") as f:
+    if orjson is not None:
+        with open(NEW_JSON, "wb") as f:
+            f.write(orjson.dumps(rows, option=orjson.OPT_INDENT_2))
+        return
+    with open(NEW_JSON, "w", encoding="utf-8", buffering=1 << 16) as f:
         json.dump(rows, f, indent=2, ensure_ascii=False)
 
 # ================= MAIN =================
@@ -23,6 +23,13 @@ from urllib.parse import urlparse
 
 from playwright.async_api import async_playwright, TimeoutError
 
+from chromium_flags import IGNORE_DEFAULT_ARGS, LAUNCH_ARGS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ---------------- CONFIG ----------------
 URL = "https://www.npci.org.in/media/press-release"
 TOP_N = 10
@@ -115,7 +122,8 @@ async def scrape():
     async with async_playwright() as p:
         browser = await p.chromium.launch(
             headless=True,
-            args=["--no-sandbox", "--disable-dev-shm-usage"]
+            args=LAUNCH_ARGS,
+            ignore_default_args=IGNORE_DEFAULT_ARGS,
         )
         context = await browser.new_context()
         page = await context.new_page()
@@ -142,9 +150,16 @@ async def scrape():
         log.info("Switching to Media Coverage tab")
         try:
             await page.click("text=Media Coverage")
-            await page.wait_for_timeout(2000)
         except Exception:
             log.warning("Media Coverage tab click failed")
+        else:
+            # Wait for the tab's rows to be shown instead of a fixed 2s pause
+            try:
+                await page.locator(
+                    "ul.press-release-body li.circulars-cell-container"
+                ).first.wait_for(timeout=10000)
+            except TimeoutError:
+                log.warning("Media Coverage rows did not render within 10s")
 
         media_container = await page.query_selector("ul.press-release-body")
         if media_container:
@@ -214,7 +229,10 @@ def main():
     existing = load_existing_ids()
     new_entries = [d for d in data if d["id"] not in existing]
 
-    NEW_JSON.write_text(json.dumps(new_entries, indent=2), encoding="utf-8")
+    if orjson is not None:
+        NEW_JSON.write_bytes(orjson.dumps(new_entries, option=orjson.OPT_INDENT_2))
+    else:
+        NEW_JSON.write_text(json.dumps(new_entries, indent=2), encoding="utf-8")
 
     if new_entries:
         append_csv(new_entries)
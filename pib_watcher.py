@@ -14,11 +14,15 @@ from urllib.parse import urljoin, urlparse, parse_qs
 URL = "https://www.pib.gov.in/allRel.aspx?reg=3&lang=1"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 
+# View page and detail pages reuse one keep-alive connection
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+
 DATA_DIR = "data"
 CSV_FILE = os.path.join(DATA_DIR, "pib_master.csv")
 JSON_FILE = os.path.join(DATA_DIR, "pib_new_entries.json")
 
-REQUEST_DELAY = 1.2
+REQUEST_DELAY = 1.2  # minimum spacing between detail page requests
 
 # ================= LOGGING =================
 
@@ -33,11 +37,29 @@ def ensure_data_dir():
     os.makedirs(DATA_DIR, exist_ok=True)
 
 
+_next_request_at = 0.0
+
+
+def wait_for_request_slot():
+    """
+    Keep detail requests REQUEST_DELAY apart. Time already spent fetching
+    and parsing counts toward the gap, and nothing waits after the last one.
+    """
+    global _next_request_at
+    wait = _next_request_at - time.monotonic()
+    if wait > 0:
+        time.sleep(wait)
+    _next_request_at = time.monotonic() + REQUEST_DELAY
+
+
 def extract_prid(url: str):
     qs = parse_qs(urlparse(url).query)
     return qs.get("PRID", [None])[0]
 
 
+_DATE_RE = re.compile(r"\b\d{1,2}\s+[A-Z]{3}\s+\d{4}\b")
+
+
 def extract_date_from_content(content: str):
     """
     Extracts date like: 17 DEC 2025
@@ -47,7 +69,7 @@ def extract_date_from_content(content: str):
         return None
 
     text = " ".join(content.split())
-    match = re.search(r"\b\d{1,2}\s+[A-Z]{3}\s+\d{4}\b", text)
+    match = _DATE_RE.search(text)
     return match.group(0) if match else None
 
 
@@ -81,7 +103,7 @@ def write_json(rows):
 
 def scrape_view_page():
     logging.info("Fetching PIB listing page")
-    r = requests.get(URL, headers=HEADERS, timeout=30)
+    r = _SESSION.get(URL, timeout=30)
     r.raise_for_status()
 
     soup = BeautifulSoup(r.text, "html.parser")
@@ -113,7 +135,8 @@ def scrape_view_page():
 
 def scrape_detail_page(url):
     logging.debug("Fetching detail page: %s", url)
-    r = requests.get(url, headers=HEADERS, timeout=30)
+    wait_for_request_slot()
+    r = _SESSION.get(url, timeout=30)
     r.raise_for_status()
 
     soup = BeautifulSoup(r.text, "html.parser")
@@ -158,7 +181,6 @@ def main():
 
         new_entries.append(row)
         existing_ids.add(item["id"])
-        time.sleep(REQUEST_DELAY)
 
     if new_entries:
         logging.info("Writing %d new entries", len(new_entries))
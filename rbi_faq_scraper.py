@@ -3,16 +3,24 @@
 # FAST VERSION — ONLY NEW ENTRIES (NO UPDATE CHECK)
 
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import urljoin, urlparse
 import requests
+import lxml.etree
 import lxml.html
 import csv
+import os
 import json
+import logging
 import re
 import time
 import datetime
 from dateutil import parser as date_parser   # pip install python-dateutil
 
+try:
+    import orjson                            # pip install orjson (optional, faster JSON)
+except ImportError:
+    orjson = None
+
 BASE = "https://rbi.org.in"
 LISTING_URL = "https://rbi.org.in/Scripts/FAQDisplay.aspx"
 
@@ -24,15 +32,69 @@ NEW_JSON = OUT_DIR / "rbi_faq_new_entries.json"
 
 HEADERS = {"User-Agent": "rbi-faq-watcher/fast-simple"}
 
-REQUEST_DELAY = 1.0  # only applies to NEW entries fetch
+# Listing + every new detail page go over one keep-alive connection
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+
+MAX_RETRIES = 3      # detail page fetch attempts
+BACKOFF_BASE = 0.5   # seconds; doubled after each failed attempt
+BACKOFF_CAP = 4.0
+
+FIELDNAMES = [
+    "faq_id",
+    "title_text",
+    "published_date",
+    "category",
+    "url",
+    "last_updated",
+    "full_text",
+    "pdf_link",
+    "pdf_filename",
+    "scraped_at"
+]
+
+WRITE_BUFFER = 1 << 20  # 1 MiB, full_text rows are large
+
+FAQ_PANEL_ID = "ctl00_ContentPlaceHolder1_pnlFAQ"
+
+# Listings at least this large are streamed with a pull parser
+STREAM_MIN_SIZE = 256 * 1024
+STREAM_CHUNK = 64 * 1024
+
+# One shared parser; we never use id lookups or network/DTD loading
+_PARSER = lxml.html.HTMLParser(collect_ids=False, no_network=True)
+
+# Precompiled XPaths (compiled once, reused for every document/row)
+_XP_FAQ_TABLE = lxml.etree.XPath(f"//div[@id='{FAQ_PANEL_ID}']//table")
+_XP_ANY_TABLE = lxml.etree.XPath("//table")
+_XP_ROWS = lxml.etree.XPath(".//tr")
+_XP_CELLS = lxml.etree.XPath("./td|./th")
+_XP_FAQ_LINK = lxml.etree.XPath(".//a[contains(@href,'FAQDisplay.aspx?Id=')]")
+# First PDF href only; positional predicate stops at the first hit
+_XP_ROW_PDF = lxml.etree.XPath(
+    "(.//a[contains(translate(@href,'PDF','pdf'),'.pdf')])[1]/@href", smart_strings=False)
+_XP_CONTENT_PANEL = lxml.etree.XPath(f"//div[@id='{FAQ_PANEL_ID}']")
+_XP_CONTENT_CLASS = lxml.etree.XPath("//div[contains(@class,'faqcontent')]")
+_XP_BODY = lxml.etree.XPath("//body")
+_XP_PAGE_PDF = lxml.etree.XPath(
+    "(//a[contains(translate(@href,'PDF','pdf'), '.pdf')])[1]/@href", smart_strings=False)
 
 
 # ----------- Utilities -----------
 
+_RE_SLUG_DROP = re.compile(r"[^\w\s-]")
+_RE_SLUG_SEP = re.compile(r"[\s-]+")
+
+
 def slugify(name, maxlen=100):
     name = name.lower()
-    name = re.sub(r"[^\w\s-]", "", name)
-    name = re.sub(r"[\s-]+", "_", name).strip("_")
+    name = _RE_SLUG_DROP.sub("", name)
+    name = _RE_SLUG_SEP.sub("_", name).strip("_")
     return name[:maxlen]
 
 
@@ -42,138 +104,271 @@ def safe_pdf_filename(faq_id, title, pdf_url):
     return f"{faq_id}_{slug}{suffix}"
 
 
+DATE_AT_START_RE = re.compile(r"^\s*([A-Za-z]{3,9}\s+\d{1,2},\s*\d{4})")
+_RE_FAQ_ID = re.compile(r"Id=(\d+)")
+_RE_LAST_UPDATED = re.compile(
+    r"(Last Updated|Last reviewed|Last Reviewed)\s*[:\-]?\s*([A-Za-z0-9 ,]{4,50})",
+    re.IGNORECASE,
+)
+_RE_BLANK_LINES = re.compile(r"\n{3,}")
+
+
 def parse_pub_date(raw):
     """Extract published date from start of text, return ISO or empty."""
-    m = re.match(r"^\s*([A-Za-z]{3,9}\s+\d{1,2},\s*\d{4})", raw)
+    m = DATE_AT_START_RE.match(raw)
     if not m:
         return ""
+    s = " ".join(m.group(1).replace(",", ", ").split())
+    # Fast path: RBI uses "Sep 17, 2025" (occasionally the full month name)
+    for fmt in ("%b %d, %Y", "%B %d, %Y"):
+        try:
+            return datetime.datetime.strptime(s, fmt).date().isoformat()
+        except ValueError:
+            pass
     try:
-        return date_parser.parse(m.group(1)).date().isoformat()
+        return date_parser.parse(s).date().isoformat()
     except:
         return ""
 
 
 def load_existing_ids():
+    """Read only the faq_id column (skip building a dict per full_text row)."""
     if not MASTER_CSV.exists():
         return set()
-    ids = set()
-    with MASTER_CSV.open(encoding="utf-8") as f:
-        r = csv.DictReader(f)
-        for row in r:
-            ids.add(row["faq_id"])
-    return ids
+    with MASTER_CSV.open(newline="", encoding="utf-8") as f:
+        r = csv.reader(f)
+        header = next(r, None)
+        if not header or "faq_id" not in header:
+            return set()
+        idx = header.index("faq_id")
+        return {row[idx] for row in r if len(row) > idx}
+
+
+def append_rows_to_master(rows):
+    """
+    Append only the given rows; header is written when the file is new.
+    Text goes through a 1 MiB buffered writer and is fsync'd once at the end.
+    """
+    if not rows:
+        return
+    csv_exists = MASTER_CSV.exists()
+    with MASTER_CSV.open("a", newline="", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        if not csv_exists:
+            writer.writeheader()
+        writer.writerows(rows)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def write_json(path, data):
+    """Dump data as indented UTF-8 JSON; orjson when available, else stdlib."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
 
 
 # ----------- Listing Table Extraction -----------
 
-def extract_listing_table(html):
+def _parse_listing_row(tr):
     """
-    Reads the main FAQ listing table.
-    Detects category header rows + normal rows.
-    Extracts only listing-level info (no detail).
-    Returns list of dicts with:
-       faq_id, title_text, published_date, category, url, pdf_link
+    Classify one listing <tr>.
+    Returns ("category", name) for a header row, ("faq", row) for an FAQ row,
+    or None for anything else.
     """
-    doc = lxml.html.fromstring(html)
-    doc.make_links_absolute(BASE)
+    tds = _XP_CELLS(tr)
+    if not tds:
+        return None
+
+    # Category header row (one cell, usually styled)
+    if len(tds) == 1:
+        txt = tds[0].text_content().strip()
+        return ("category", txt) if txt else None
+
+    # Regular row — look for FAQ link
+    a = _XP_FAQ_LINK(tr)
+    if not a:
+        return None
+    a = a[0]
+
+    # Absolutize only the hrefs we keep (no whole-document link rewrite);
+    # RBI listing often gives "FAQDisplay.aspx?Id=174"
+    url = urljoin(BASE, (a.get("href") or "").strip())
+
+    row_text = tr.text_content().strip()
+
+    # Extract FAQ ID
+    m = _RE_FAQ_ID.search(url)
+    if not m:
+        return None
+    faq_id = m.group(1)
 
-    table_nodes = doc.xpath("//div[@id='ctl00_ContentPlaceHolder1_pnlFAQ']//table")
+    # Extract published date + title
+    published_date = parse_pub_date(row_text)
+    title_text = a.text_content().strip()
+
+    # Extract PDF link if present
+    hits = _XP_ROW_PDF(tr)
+    pdf_link = urljoin(BASE, hits[0].strip()) if hits else ""
+
+    return ("faq", {
+        "faq_id": faq_id,
+        "title_text": title_text,
+        "published_date": published_date,
+        "category": "",
+        "url": url,
+        "pdf_link": pdf_link
+    })
+
+
+def _listing_rows_dom(html):
+    """Parse the whole listing page into a tree (small pages)."""
+    doc = lxml.html.fromstring(html, parser=_PARSER)
+
+    table_nodes = _XP_FAQ_TABLE(doc)
     if not table_nodes:
-        table_nodes = doc.xpath("//table")
+        table_nodes = _XP_ANY_TABLE(doc)
     if not table_nodes:
         return []
 
-    table = table_nodes[0]
-    rows = []
-    current_category = ""
+    parsed = (_parse_listing_row(tr) for tr in _XP_ROWS(table_nodes[0]))
+    return [p for p in parsed if p]
 
-    for tr in table.xpath(".//tr"):
-        tds = tr.xpath("./td|./th")
-        if not tds:
-            continue
 
-        # Category header row (one cell, usually styled)
-        if len(tds) == 1:
-            txt = tds[0].text_content().strip()
-            if txt:
-                current_category = txt
+def _pull_events(parser, text):
+    """Feed text in chunks, yielding parse events as soon as they are ready."""
+    for i in range(0, len(text), STREAM_CHUNK):
+        parser.feed(text[i:i + STREAM_CHUNK])
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def _listing_rows_stream(html):
+    """
+    Stream the listing page and handle each <tr> as soon as it is complete,
+    clearing it afterwards so only the current row's nodes stay in memory.
+    Same table choice as the DOM path: the first table inside the FAQ panel,
+    else the first table in the page.
+
+    A row's slot is reserved on its start tag and filled on its end tag, so
+    rows come out in document order (an outer row before the rows of a table
+    nested inside it), like .//tr in the DOM path.
+    """
+    parser = lxml.etree.HTMLPullParser(events=("start", "end"),
+                                       collect_ids=False, no_network=True)
+    parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+
+    faq_table = first_table = None
+    faq_rows, first_rows = [], []
+    slots = {}  # open <tr> -> [(rows list, index), ...]
+
+    for event, el in _pull_events(parser, html):
+        if event == "start":
+            if el.tag == "table":
+                if first_table is None:
+                    first_table = el
+                if faq_table is None and any(d.get("id") == FAQ_PANEL_ID
+                                             for d in el.iterancestors("div")):
+                    faq_table = el
+            elif el.tag == "tr":
+                tables = list(el.iterancestors("table"))
+                targets = []
+                if faq_table is not None and faq_table in tables:
+                    targets.append(faq_rows)
+                if first_table is not None and first_table in tables:
+                    targets.append(first_rows)
+                if targets:
+                    slots[el] = [(rows, len(rows)) for rows in targets]
+                    for rows in targets:
+                        rows.append(None)
             continue
 
-        # Regular row — look for FAQ link
-        a = tr.xpath(".//a[contains(@href,'FAQDisplay.aspx?Id=')]")
-        if not a:
+        if el.tag != "tr":
             continue
-        a = a[0]
 
-        raw = a.get("href") or ""
+        targets = slots.pop(el, None)
+        if targets:
+            parsed = _parse_listing_row(el)
+            for rows, i in targets:
+                rows[i] = parsed
 
-        # RBI listing often gives "FAQDisplay.aspx?Id=174"
-        if raw.lower().startswith("faqdisplay.aspx"):
-            url = f"https://rbi.org.in/Scripts/{raw}"
-        elif raw.lower().startswith("/scripts/"):
-            url = "https://rbi.org.in" + raw
-        else:
-            # Fallback – absolute link that doc.make_links_absolute may generate
-            url = raw
+        # Drop the handled row (and earlier siblings) unless an outer row
+        # still needs it for its own text
+        if next(el.iterancestors("tr"), None) is None:
+            el.clear(keep_tail=True)
+            while el.getprevious() is not None:
+                del el.getparent()[0]
 
-        row_text = tr.text_content().strip()
+    rows = faq_rows if faq_table is not None else first_rows
+    return [p for p in rows if p]
+
+
+def extract_listing_table(html):
+    """
+    Reads the main FAQ listing table.
+    Detects category header rows + normal rows.
+    Extracts only listing-level info (no detail).
+    Large pages are streamed row by row instead of building the full tree.
+    Returns list of dicts with:
+       faq_id, title_text, published_date, category, url, pdf_link
+    """
+    if len(html) < STREAM_MIN_SIZE:
+        parsed = _listing_rows_dom(html)
+    else:
+        parsed = _listing_rows_stream(html)
 
-        # Extract FAQ ID
-        m = re.search(r"Id=(\d+)", url)
-        if not m:
+    rows = []
+    current_category = ""
+
+    for kind, value in parsed:
+        if kind == "category":
+            current_category = value
             continue
-        faq_id = m.group(1)
-
-        # Extract published date + title
-        published_date = parse_pub_date(row_text)
-        title_text = a.text_content().strip()
-
-        # Extract PDF link if present
-        pdf_link = ""
-        pdf_a = tr.xpath(".//a[contains(translate(@href,'PDF','pdf'),'.pdf')]")
-        if pdf_a:
-            pdf_link = pdf_a[0].get("href")
-
-        rows.append({
-            "faq_id": faq_id,
-            "title_text": title_text,
-            "published_date": published_date,
-            "category": current_category,
-            "url": url,
-            "pdf_link": pdf_link
-        })
+        value["category"] = current_category
+        rows.append(value)
 
     return rows
 
 
 # ----------- Detail Page Extraction (ONLY for NEW ENTRIES) -----------
 
+def get_with_backoff(url):
+    """GET with no delay on success; exponential backoff between failed attempts."""
+    for attempt in range(MAX_RETRIES):
+        try:
+            r = _SESSION.get(url)
+            r.raise_for_status()
+            return r
+        except requests.RequestException:
+            if attempt + 1 == MAX_RETRIES:
+                raise
+            time.sleep(min(BACKOFF_BASE * 2 ** attempt, BACKOFF_CAP))
+
+
 def extract_detail_page(url):
-    r = requests.get(url, headers=HEADERS)
-    r.raise_for_status()
-    doc = lxml.html.fromstring(r.text)
-    doc.make_links_absolute(url)
+    r = get_with_backoff(url)
+    doc = lxml.html.fromstring(r.text, parser=_PARSER)
 
     whole_text = doc.text_content()
 
     # Try to extract "Last Updated"
-    m = re.search(r"(Last Updated|Last reviewed|Last Reviewed)\s*[:\-]?\s*([A-Za-z0-9 ,]{4,50})",
-                  whole_text, flags=re.IGNORECASE)
+    m = _RE_LAST_UPDATED.search(whole_text)
     last_updated = m.group(2).strip() if m else ""
 
     # Extract main content text (visible text including table)
-    content_nodes = doc.xpath("//div[@id='ctl00_ContentPlaceHolder1_pnlFAQ']") or \
-                    doc.xpath("//div[contains(@class,'faqcontent')]") or \
-                    doc.xpath("//body")
+    content_nodes = _XP_CONTENT_PANEL(doc) or \
+                    _XP_CONTENT_CLASS(doc) or \
+                    _XP_BODY(doc)
 
     text = "\n\n".join(n.text_content() for n in content_nodes)
-    text = re.sub(r"\n{3,}", "\n\n", text).strip()
+    text = _RE_BLANK_LINES.sub("\n\n", text).strip()
 
     # Extract PDF link on detail page (if not present in listing)
-    pdf_link = ""
-    a = doc.xpath("//a[contains(translate(@href,'PDF','pdf'), '.pdf')]")
-    if a:
-        pdf_link = a[0].get("href")
+    hits = _XP_PAGE_PDF(doc)
+    pdf_link = urljoin(url, hits[0].strip()) if hits else ""
 
     return text, last_updated, pdf_link
 
@@ -181,79 +376,59 @@ def extract_detail_page(url):
 # ----------- MAIN -----------
 
 def main():
-    print("Running RBI FAQ Watcher (FAST MODE: Only New IDs)")
+    logging.info("Running RBI FAQ Watcher (FAST MODE: Only New IDs)")
 
     existing_ids = load_existing_ids()
-    print(f"Loaded {len(existing_ids)} existing IDs")
+    logging.info("Loaded %d existing IDs", len(existing_ids))
 
     # Fetch listing
-    listing_html = requests.get(LISTING_URL, headers=HEADERS).text
+    listing_html = _SESSION.get(LISTING_URL).text
     listing_rows = extract_listing_table(listing_html)
-    print(f"Found {len(listing_rows)} listing rows")
+    logging.info("Found %d listing rows", len(listing_rows))
 
     new_items = []
     now_iso = datetime.datetime.now().isoformat()
 
-    # Open CSV in append mode
-    csv_exists = MASTER_CSV.exists()
-    f = MASTER_CSV.open("a", newline="", encoding="utf-8")
-    writer = csv.DictWriter(f, fieldnames=[
-        "faq_id",
-        "title_text",
-        "published_date",
-        "category",
-        "url",
-        "last_updated",
-        "full_text",
-        "pdf_link",
-        "pdf_filename",
-        "scraped_at"
-    ])
-    if not csv_exists:
-        writer.writeheader()
-
-    for row in listing_rows:
-        faq_id = row["faq_id"]
-
-        if faq_id in existing_ids:
-            # Skip old entry (FAST MODE)
-            continue
-
-        print(f"NEW ENTRY FOUND: {faq_id} — Fetching detail page...")
-
-        time.sleep(REQUEST_DELAY)
-
-        full_text, last_updated, page_pdf_link = extract_detail_page(row["url"])
-
-        # choose pdf link: listing > page
-        pdf_link = row["pdf_link"] or page_pdf_link or ""
-        pdf_filename = safe_pdf_filename(faq_id, row["title_text"], pdf_link) if pdf_link else ""
-
-        item = {
-            "faq_id": faq_id,
-            "title_text": row["title_text"],
-            "published_date": row["published_date"],
-            "category": row["category"],
-            "url": row["url"],
-            "last_updated": last_updated,
-            "full_text": full_text,
-            "pdf_link": pdf_link,
-            "pdf_filename": pdf_filename,
-            "scraped_at": now_iso
-        }
-
-        writer.writerow(item)
-        new_items.append(item)
-
-    f.close()
-
-    # write JSON of only new items
-    with NEW_JSON.open("w", encoding="utf-8") as jf:
-        json.dump({"new_items": new_items}, jf, indent=2, ensure_ascii=False)
-
-    print(f"Completed. New entries found: {len(new_items)}")
-    print(f"CSV updated: {MASTER_CSV}")
-    print(f"New JSON: {NEW_JSON}")
+    # Rows fetched before a failed detail page are still saved
+    try:
+        for row in listing_rows:
+            faq_id = row["faq_id"]
+
+            if faq_id in existing_ids:
+                # Skip old entry (FAST MODE)
+                continue
+
+            logging.info("NEW ENTRY FOUND: %s — Fetching detail page...", faq_id)
+
+            full_text, last_updated, page_pdf_link = extract_detail_page(row["url"])
+
+            # choose pdf link: listing > page
+            pdf_link = row["pdf_link"] or page_pdf_link or ""
+            pdf_filename = safe_pdf_filename(faq_id, row["title_text"], pdf_link) if pdf_link else ""
+
+            item = {
+                "faq_id": faq_id,
+                "title_text": row["title_text"],
+                "published_date": row["published_date"],
+                "category": row["category"],
+                "url": row["url"],
+                "last_updated": last_updated,
+                "full_text": full_text,
+                "pdf_link": pdf_link,
+                "pdf_filename": pdf_filename,
+                "scraped_at": now_iso
+            }
+
+            new_items.append(item)
+    finally:
+        append_rows_to_master(new_items)
+
+        # write JSON of only new items
+        write_json(NEW_JSON, {"new_items": new_items})
+
+    logging.info("Completed. New entries found: %d", len(new_items))
+    logging.info("CSV updated: %s", MASTER_CSV)
+    logging.info("New JSON: %s", NEW_JSON)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,6 @@
+import asyncio
 import csv
+import functools
 import json
 import logging
 import os
@@ -7,7 +9,14 @@ from datetime import datetime, timezone
 from urllib.parse import urljoin, urlparse, parse_qs
 
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
+
+from chromium_flags import IGNORE_DEFAULT_ARGS, LAUNCH_ARGS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ============================================================
 # CONFIG
@@ -31,6 +40,25 @@ LICENSE_MAP = {
 DATA_DIR = "data"
 MASTER_CSV = os.path.join(DATA_DIR, "saralsanchar_master.csv")
 NEW_JSON = os.path.join(DATA_DIR, "saralsanchar_new_entries.json")
+IDS_FILE = os.path.join(DATA_DIR, "saralsanchar_master.ids")  # one id per line, mirrors MASTER_CSV
+
+FIELDNAMES = [
+    "id",
+    "license",
+    "date",
+    "title",
+    "pdf_link",
+    "pdf_filename",
+    "source_page",
+    "scraped_at",
+]
+
+# License XHRs are independent; a few at a time keeps the server happy
+MAX_CONCURRENT_REQUESTS = 4
+
+# The page is only opened for its session cookies; skip everything heavy
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+BLOCKED_URL_PATTERNS = ("google-analytics.com", "googletagmanager.com", "doubleclick.net")
 
 # ============================================================
 # LOGGING
@@ -51,18 +79,23 @@ def ensure_dirs():
 def now_iso():
     return datetime.now(timezone.utc).isoformat()
 
+_SLUG_RE = re.compile(r"[^a-z0-9\s]")
+
+@functools.lru_cache(maxsize=4096)
 def slugify(text, max_words=8, max_chars=80):
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9\s]", "", text)
-    words = text.split()[:max_words]
+    words = _SLUG_RE.sub("", text.lower()).split()[:max_words]
     slug = "-".join(words)
     return slug[:max_chars].rstrip("-")
 
+# License names never change, slug them once at import
+_LICENSE_SLUGS = {code: slugify(name) for code, name in LICENSE_MAP.items()}
+
+@functools.lru_cache(maxsize=8192)
 def generate_pdf_filename(license_code, title, doc_id):
-    license_full = LICENSE_MAP.get(license_code, license_code)
+    license_slug = _LICENSE_SLUGS.get(license_code) or slugify(license_code)
     return (
         f"saralsanchar_"
-        f"{slugify(license_full)}_"
+        f"{license_slug}_"
         f"{slugify(title)}_"
         f"{doc_id}.pdf"
     )
@@ -70,44 +103,82 @@ def generate_pdf_filename(license_code, title, doc_id):
 def load_existing_ids():
     if not os.path.exists(MASTER_CSV):
         return set()
+
+    if os.path.exists(IDS_FILE):
+        with open(IDS_FILE, encoding="utf-8") as f:
+            return set(f.read().splitlines())
+
+    # One-time rebuild of the side index from the master CSV
     with open(MASTER_CSV, newline="", encoding="utf-8") as f:
-        return {row["id"] for row in csv.DictReader(f)}
+        r = csv.reader(f)
+        header = next(r, None)
+        ids = set()
+        if header and "id" in header:
+            idx = header.index("id")
+            ids = {row[idx] for row in r if len(row) > idx}
+    with open(IDS_FILE, "w", encoding="utf-8") as f:
+        f.writelines(f"{i}\n" for i in sorted(ids))
+    return ids
 
 # ============================================================
-# CORE SCRAPER (XHR via page.evaluate)
+# CORE SCRAPER (XHR via page.request)
 # ============================================================
 
-def fetch_html_via_browser(page, license_code):
-    logging.info("Fetching backend HTML for license: %s", license_code)
-
-    html = page.evaluate(
-        """
-        async ({ endpoint, license }) => {
-            const resp = await fetch(endpoint, {
-                method: "POST",
-                credentials: "same-origin",
-                headers: {
-                    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-                    "X-Requested-With": "XMLHttpRequest"
-                },
-                body: "circular_type=" + encodeURIComponent(license)
-            });
-            return await resp.text();
-        }
-        """,
-        {
-            "endpoint": "https://saralsanchar.gov.in/common/get_circular_list.php",
-            "license": license_code
-        }
-    )
+async def block_heavy_resources(route):
+    request = route.request
+    if (request.resource_type in BLOCKED_RESOURCE_TYPES
+            or any(p in request.url for p in BLOCKED_URL_PATTERNS)):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def fetch_html_via_browser(page, license_codes):
+    """
+    POST the XHR endpoint for every license concurrently through Playwright's
+    native APIRequestContext (shares the page's cookies, no JS evaluation).
+    Returns {license_code: html}.
+    """
+    endpoint = urljoin(BASE_DOMAIN, XHR_ENDPOINT)
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def fetch_one(license_code):
+        async with sem:
+            logging.info("Fetching backend HTML for license: %s", license_code)
+            resp = await page.request.post(
+                endpoint,
+                form={"circular_type": license_code},
+                headers={"X-Requested-With": "XMLHttpRequest"},
+            )
+            return license_code, await resp.text()
+
+    return dict(await asyncio.gather(*(fetch_one(lc) for lc in license_codes)))
+
+async def scrape():
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
+            headless=True,
+            args=LAUNCH_ARGS,
+            ignore_default_args=IGNORE_DEFAULT_ARGS,
+        )
+        context = await browser.new_context()
+        await context.route("**/*", block_heavy_resources)
+        page = await context.new_page()
+
+        logging.info("Opening Saral Sanchar page")
+        await page.goto(BASE_URL, wait_until="domcontentloaded", timeout=60000)
 
-    return html
+        html_by_license = await fetch_html_via_browser(page, LICENSES)
+
+        await browser.close()
+
+    return html_by_license
 
 def parse_html(html, license_code):
     soup = BeautifulSoup(html, "html.parser")
     rows = soup.select("table tbody tr")
 
     records = []
+    scraped_at = now_iso()
 
     for row in rows:
         cols = row.find_all("td")
@@ -141,7 +212,7 @@ def parse_html(html, license_code):
                 license_code, title, f_param
             ),
             "source_page": BASE_URL,
-            "scraped_at": now_iso(),
+            "scraped_at": scraped_at,
         })
 
     logging.info("Parsed %d rows for %s", len(records), license_code)
@@ -151,31 +222,49 @@ def parse_html(html, license_code):
 # SAVE
 # ============================================================
 
-def append_to_master(rows):
-    exists = os.path.exists(MASTER_CSV)
-
-    with open(MASTER_CSV, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=[
-                "id",
-                "license",
-                "date",
-                "title",
-                "pdf_link",
-                "pdf_filename",
-                "source_page",
-                "scraped_at",
-            ],
-        )
-
-        if not exists:
-            writer.writeheader()
-
-        writer.writerows(rows)
+class MasterStore:
+    """
+    Existing ids (loaded once) plus buffered append handles on MASTER_CSV and
+    IDS_FILE, kept open for the whole run. Files are only opened on the first
+    write.
+    """
+
+    def __init__(self):
+        self.ids = load_existing_ids()
+        self._f = None
+        self._ids_f = None
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        for f in (self._f, self._ids_f):
+            if f is not None:
+                f.close()
+
+    def __contains__(self, record_id):
+        return record_id in self.ids
+
+    def write(self, row):
+        if self._writer is None:
+            exists = os.path.exists(MASTER_CSV)
+            self._f = open(MASTER_CSV, "a", newline="", encoding="utf-8", buffering=1 << 16)
+            self._ids_f = open(IDS_FILE, "a", encoding="utf-8")
+            self._writer = csv.DictWriter(self._f, fieldnames=FIELDNAMES)
+            if not exists:
+                self._writer.writeheader()
+
+        self._writer.writerow(row)
+        self._ids_f.write(f"{row['id']}\n")
+        self.ids.add(row["id"])
 
 def write_new_entries(rows):
-    with open(NEW_JSON, "w", encoding="utf-8") as f:
+    if orjson is not None:
+        with open(NEW_JSON, "wb") as f:
+            f.write(orjson.dumps(rows, option=orjson.OPT_INDENT_2))
+        return
+    with open(NEW_JSON, "w", encoding="utf-8", buffering=1 << 16) as f:
         json.dump(rows, f, indent=2, ensure_ascii=False)
 
 # ============================================================
@@ -185,30 +274,24 @@ def write_new_entries(rows):
 def main():
     ensure_dirs()
 
-    existing_ids = load_existing_ids()
-    logging.info("Loaded %d existing Saral Sanchar records", len(existing_ids))
+    store = MasterStore()
+    logging.info("Loaded %d existing Saral Sanchar records", len(store.ids))
 
     all_scraped = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=["--disable-blink-features=AutomationControlled"]
-        )
-        context = browser.new_context()
-        page = context.new_page()
-
-        logging.info("Opening Saral Sanchar page")
-        page.goto(BASE_URL, wait_until="domcontentloaded", timeout=60000)
-
-        for license_code in LICENSES:
-            html = fetch_html_via_browser(page, license_code)
-            records = parse_html(html, license_code)
-            all_scraped.extend(records)
+    html_by_license = asyncio.run(scrape())
 
-        browser.close()
+    for license_code in LICENSES:
+        records = parse_html(html_by_license[license_code], license_code)
+        all_scraped.extend(records)
 
-    new_items = [r for r in all_scraped if r["id"] not in existing_ids]
+    new_items = []
+    with store:
+        for r in all_scraped:
+            if r["id"] in store:
+                continue
+            store.write(r)
+            new_items.append(r)
 
     if not new_items:
         logging.info("No new Saral Sanchar circulars found")
@@ -217,7 +300,6 @@ def main():
 
     logging.info("Detected %d NEW Saral Sanchar circulars", len(new_items))
 
-    append_to_master(new_items)
     write_new_entries(new_items)
 
     logging.info("Saral Sanchar CSV and JSON updated successfully")
@@ -8,7 +8,13 @@ from datetime import datetime, timezone
 from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ================= CONFIG =================
 
@@ -19,11 +25,23 @@ DATA_DIR = "data"
 MASTER_CSV = os.path.join(DATA_DIR, "saras_master.csv")
 NEW_JSON = os.path.join(DATA_DIR, "saras_new_entries.json")
 
+FIELDNAMES = [
+    "id",
+    "title",
+    "pdf_link",
+    "pdf_filename",
+    "file_size",
+    "source_page",
+    "scraped_at",
+]
+
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Regulatory Watcher; SARAS)",
     "Accept-Language": "en-US,en;q=0.9",
 }
 
+_SIZE_RE = re.compile(r"\(([\d\.]+\s*MB)\)")
+
 # ================= LOGGING =================
 
 logging.basicConfig(
@@ -39,16 +57,33 @@ def ensure_dirs():
 def now_iso():
     return datetime.now(timezone.utc).isoformat()
 
+# Ids stay SHA1: existing master rows are deduped by them
+_sha1 = hashlib.sha1
+
 def sha1(text: str) -> str:
-    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+    return _sha1(text.encode("utf-8")).hexdigest()
+
+_SLUG_RE = re.compile(r"[^a-z0-9\s]")
 
 def slugify_title(title, max_words=8, max_chars=80):
-    title = title.lower()
-    title = re.sub(r"[^a-z0-9\s]", "", title)
+    title = _SLUG_RE.sub("", title.lower())
     words = title.split()[:max_words]
     slug = "-".join(words)
     return slug[:max_chars].rstrip("-")
 
+def node_text(node):
+    """
+    Stripped, non-empty text nodes joined by a space (skips script/style).
+    Matches BeautifulSoup's get_text(" ", strip=True) so record ids are unchanged.
+    """
+    parts = []
+    for n in node.traverse(include_text=True):
+        if n.tag == "-text" and n.parent.tag not in ("script", "style"):
+            text = n.text_content.strip()
+            if text:
+                parts.append(text)
+    return " ".join(parts)
+
 def generate_pdf_filename(title, record_id):
     slug = slugify_title(title)
     suffix = record_id[-8:]   # last 8 chars of SHA1
@@ -62,44 +97,55 @@ def load_existing_ids():
         return set()
 
     with open(MASTER_CSV, newline="", encoding="utf-8") as f:
-        return {row["id"] for row in csv.DictReader(f)}
+        r = csv.reader(f)
+        header = next(r, None)
+        if not header or "id" not in header:
+            return set()
+        idx = header.index("id")
+        return {row[idx] for row in r if len(row) > idx}
 
 # ================= SCRAPER =================
 
+# One keep-alive session for every request to the SARAS host
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 def fetch_latest_updates():
     logging.info("Fetching SARAS homepage")
-    r = requests.get(BASE_URL, headers=HEADERS, timeout=30)
+    r = _SESSION.get(BASE_URL, timeout=30)
     r.raise_for_status()
 
-    soup = BeautifulSoup(r.text, "html.parser")
+    tree = LexborHTMLParser(r.text)
 
-    container = soup.select_one("#LatestUpdates")
+    container = tree.css_first("#LatestUpdates")
     if not container:
         logging.warning("LatestUpdates section not found")
         return []
 
-    items = container.select(".media.p-lm")
+    items = container.css(".media.p-lm")
     logging.info("Found %d items in Latest Updates", len(items))
 
     results = []
+    scraped_at = now_iso()
 
     for block in items:
-        p = block.select_one(".media-body p")
-        a = block.select_one("a[href]")
+        p = block.css_first(".media-body p")
+        a = block.css_first("a[href]")
 
         if not p or not a:
             continue
 
-        full_text = p.get_text(" ", strip=True)
+        full_text = node_text(p)
 
         # Title = text before 'Download'
         title = full_text.split("Download")[0].strip()
 
-        href = a.get("href").strip()
+        href = (a.attributes.get("href") or "").strip()
         pdf_link = urljoin(BASE_DOMAIN, href)
 
         # Extract file size if present
-        size_match = re.search(r"\(([\d\.]+\s*MB)\)", full_text)
+        size_match = _SIZE_RE.search(full_text)
         file_size = size_match.group(1) if size_match else ""
 
         record_id = sha1(title + pdf_link)
@@ -111,37 +157,51 @@ def fetch_latest_updates():
             "pdf_filename": generate_pdf_filename(title,record_id),
             "file_size": file_size,
             "source_page": BASE_URL,
-            "scraped_at": now_iso(),
+            "scraped_at": scraped_at,
         })
 
     return results
 
 # ================= SAVE =================
 
-def append_to_master(rows):
-    exists = os.path.exists(MASTER_CSV)
+class MasterStore:
+    """
+    Existing ids (loaded once) plus one buffered append handle on MASTER_CSV,
+    kept open for the whole run. The file is only opened on the first write.
+    """
+
+    def __init__(self):
+        self.ids = load_existing_ids()
+        self._f = None
+        self._writer = None
+
+    def __enter__(self):
+        return self
 
-    with open(MASTER_CSV, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=[
-                "id",
-                "title",
-                "pdf_link",
-                "pdf_filename",
-                "file_size",
-                "source_page",
-                "scraped_at",
-            ],
-        )
+    def __exit__(self, *exc):
+        if self._f is not None:
+            self._f.close()
 
-        if not exists:
-            writer.writeheader()
+    def __contains__(self, record_id):
+        return record_id in self.ids
 
-        writer.writerows(rows)
+    def write(self, row):
+        if self._writer is None:
+            exists = os.path.exists(MASTER_CSV)
+            self._f = open(MASTER_CSV, "a", newline="", encoding="utf-8", buffering=1 << 16)
+            self._writer = csv.DictWriter(self._f, fieldnames=FIELDNAMES)
+            if not exists:
+                self._writer.writeheader()
+
+        self._writer.writerow(row)
+        self.ids.add(row["id"])
 
 def write_new_entries(rows):
-    with open(NEW_JSON, "w", encoding="utf-8") as f:
+    if orjson is not None:
+        with open(NEW_JSON, "wb") as f:
+            f.write(orjson.dumps(rows, option=orjson.OPT_INDENT_2))
+        return
+    with open(NEW_JSON, "w", encoding="utf-8", buffering=1 << 16) as f:
         json.dump(rows, f, indent=2, ensure_ascii=False)
 
 # ================= MAIN =================
@@ -149,12 +209,18 @@ def write_new_entries(rows):
 def main():
     ensure_dirs()
 
-    existing_ids = load_existing_ids()
-    logging.info("Loaded %d existing SARAS records", len(existing_ids))
+    store = MasterStore()
+    logging.info("Loaded %d existing SARAS records", len(store.ids))
 
     current_items = fetch_latest_updates()
 
-    new_items = [i for i in current_items if i["id"] not in existing_ids]
+    new_items = []
+    with store:
+        for item in current_items:
+            if item["id"] in store:
+                continue
+            store.write(item)
+            new_items.append(item)
 
     if not new_items:
         logging.info("No new SARAS updates found")
@@ -163,7 +229,6 @@ def main():
 
     logging.info("Detected %d NEW SARAS updates", len(new_items))
 
-    append_to_master(new_items)
     write_new_entries(new_items)
 
     logging.info("SARAS CSV and JSON updated successfully")
@@ -4,6 +4,8 @@ SEBI Multi-Section Scraper (FULL-PROOF)
 
 ✔ GitHub Actions safe
 ✔ Playwright hardened
+✔ Sections + detail pages fetched concurrently (async page pool)
+✔ Detail pages read over plain HTTP, browser only as fallback
 ✔ Timeout-tolerant
 ✔ Backward-compatible with old CSVs
 ✔ Never crashes on SEBI slow pages
@@ -18,17 +20,26 @@ import os
 os.environ.setdefault("PLAYWRIGHT_BROWSERS_PATH", "0")
 
 # ===================== IMPORTS =====================
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
+from selectolax.lexbor import LexborHTMLParser
+from chromium_flags import IGNORE_DEFAULT_ARGS, LAUNCH_ARGS
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
+import asyncio
+import contextlib
 import csv
+import functools
 import hashlib
 import re
 import datetime
 import json
-import time
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ===================== CONFIG =====================
 NUM_ENTRIES = 10
 DATA_DIR = Path("data")
@@ -37,8 +48,19 @@ DATA_DIR.mkdir(exist_ok=True)
 MASTER_CSV = DATA_DIR / "sebi_master.csv"
 NEW_JSON   = DATA_DIR / "sebi_new_entries.json"
 
+# Cookies carried between runs (restored by actions/cache, never committed)
+STATE_FILE = Path(".cache") / "sebi_storage_state.json"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120 Safari/537.36"
+
 DETAIL_PAGE_TIMEOUT = 20000  # 20s (SEBI-safe)
-DETAIL_PAGE_DELAY = 0.7
+DETAIL_RETRIES = 3          # attempts per detail page
+BACKOFF_BASE = 0.5          # seconds; doubled after each failed attempt
+BACKOFF_CAP = 4.0
+MAX_CONCURRENT_PAGES = 6
+
+# Never needed to read listings/detail links; aborted at the network layer
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+BLOCKED_URL_PATTERNS = ("google-analytics.com", "googletagmanager.com", "doubleclick.net")
 
 SECTIONS = {
     "https://www.sebi.gov.in/sebiweb/home/HomeAction.do?doListing=yes&sid=1&ssid=1&smid=0": "Act",
@@ -50,6 +72,13 @@ SECTIONS = {
     "https://www.sebi.gov.in/sebiweb/home/HomeAction.do?doListing=yes&sid=1&ssid=7&smid=0": "Circular",
 }
 
+PDF_SELECTORS = ("a[href*='.pdf']", "iframe[src*='.pdf']", "embed[src*='.pdf']")
+
+_YEAR_RE = re.compile(r"\d{4}")
+_FNAME_RE = re.compile(r'[\/\\:*?"<>|]+')
+_WS_RE = re.compile(r"\s+")
+_INNER_WS_RE = re.compile(r"[ \t\n\r\f]+")  # what innerText collapses (not &nbsp;)
+
 HEADERS = [
     "id", "date", "title", "link", "pdf_link",
     "pdf_filename", "pdf_downloaded",
@@ -64,18 +93,26 @@ logging.basicConfig(
 logger = logging.getLogger("SEBI-SCRAPER")
 
 # ===================== HELPERS =====================
+# Ids stay SHA1: they are stored in sebi_master.csv
+_sha1 = hashlib.sha1
+
 def sha_id(*parts):
-    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+    return _sha1("|".join(parts).encode()).hexdigest()
 
+@functools.lru_cache(maxsize=4096)
 def normalize_link(url):
     if not url:
         return ""
     p = urlparse(url)
     return f"{p.scheme or 'https'}://{p.netloc}{p.path.rstrip('/')}"
 
+def _key(title, link):
+    """Dedupe key shared by master rows and freshly scraped entries."""
+    return (title.lower().strip(), normalize_link(link))
+
 def safe_filename(text):
-    text = re.sub(r'[\/\\:*?"<>|]+', "_", text or "document")
-    text = re.sub(r"\s+", " ", text).strip()[:150]
+    text = _FNAME_RE.sub("_", text or "document")
+    text = _WS_RE.sub(" ", text).strip()[:150]
     if not text.lower().endswith(".pdf"):
         text += ".pdf"
     return text
@@ -90,7 +127,7 @@ def normalize_date(date_str: str) -> str:
 
     d = date_str.strip()
 
-    if re.fullmatch(r"\d{4}", d):
+    if _YEAR_RE.fullmatch(d):
         return f"01-01-{d}"
 
     return d
@@ -101,131 +138,368 @@ def load_master():
     with open(MASTER_CSV, newline="", encoding="utf-8") as f:
         return list(csv.DictReader(f))
 
+def load_existing_keys():
+    """Dedupe keys straight off csv.reader; only title/link are kept in memory."""
+    if not MASTER_CSV.exists():
+        return set()
+    with open(MASTER_CSV, newline="", encoding="utf-8") as f:
+        r = csv.reader(f)
+        header = next(r, None)
+        if not header or "title" not in header or "link" not in header:
+            return set()
+        ti, li = header.index("title"), header.index("link")
+        need = max(ti, li)
+
+        keys = set()
+        for row in r:
+            if len(row) > need:
+                key = _key(row[ti], row[li])
+                if key[0] and key[1]:
+                    keys.add(key)
+        return keys
+
 def write_master(rows):
     with open(MASTER_CSV, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=HEADERS, quoting=csv.QUOTE_ALL)
         writer.writeheader()
         writer.writerows(rows)
 
+def read_master_header():
+    with open(MASTER_CSV, newline="", encoding="utf-8") as f:
+        return next(csv.reader(f), None)
+
+def append_to_master(rows):
+    """Append only new rows; header is written when the file is new."""
+    if not rows:
+        return
+
+    exists = MASTER_CSV.exists()
+    if exists and read_master_header() != HEADERS:
+        # Old column layout: migrate once by rewriting with current HEADERS
+        logger.info("Master CSV header differs from HEADERS, rewriting once")
+        write_master(load_master() + rows)
+        return
+
+    with open(MASTER_CSV, "a", newline="", encoding="utf-8", buffering=1 << 16) as f:
+        writer = csv.DictWriter(f, fieldnames=HEADERS, quoting=csv.QUOTE_ALL)
+        if not exists:
+            writer.writeheader()
+        writer.writerows(rows)
+
+def write_new_json(rows):
+    if orjson is not None:
+        with open(NEW_JSON, "wb") as f:
+            f.write(orjson.dumps(rows, option=orjson.OPT_INDENT_2))
+        return
+    with open(NEW_JSON, "w", encoding="utf-8", buffering=1 << 16) as f:
+        json.dump(rows, f, indent=2, ensure_ascii=False)
+
+async def block_heavy_resources(route):
+    request = route.request
+    if (request.resource_type in BLOCKED_RESOURCE_TYPES
+            or any(p in request.url for p in BLOCKED_URL_PATTERNS)):
+        await route.abort()
+    else:
+        await route.continue_()
+
+# ===================== PAGE POOL =====================
+class PagePool:
+    """
+    Reusable pages on a single browser context.
+    At most `max_pages` pages exist, which also bounds concurrency.
+    """
+
+    def __init__(self, context, max_pages=MAX_CONCURRENT_PAGES):
+        self.context = context
+        self.max_pages = max_pages
+        self._idle = asyncio.Queue()
+        self._created = 0
+
+    async def acquire(self):
+        if self._idle.empty() and self._created < self.max_pages:
+            self._created += 1
+            return await self.context.new_page()
+        return await self._idle.get()
+
+    def release(self, page):
+        self._idle.put_nowait(page)
+
+    @contextlib.asynccontextmanager
+    async def page(self):
+        page = await self.acquire()
+        try:
+            yield page
+        finally:
+            self.release(page)
+
 # ===================== EXTRACTION =====================
-def extract_listing(page, base_url):
-    items = []
-    for tr in page.query_selector_all("table tr"):
-        tds = tr.query_selector_all("td")
-        a = tr.query_selector("a")
-        if len(tds) >= 2 and a:
-            items.append({
-                "date": normalize_date(tds[0].inner_text()),
-                "title": a.inner_text().strip(),
-                "link": urljoin(base_url, a.get_attribute("href") or "")
-            })
-    return items
-
-def find_pdf(page):
-    for sel in ["a[href*='.pdf']", "iframe[src*='.pdf']", "embed[src*='.pdf']"]:
-        el = page.query_selector(sel)
+# All listing rows in one browser round-trip (instead of ~5 calls per row)
+LISTING_ROWS_JS = """
+rows => rows.map(tr => {
+    const tds = tr.querySelectorAll("td");
+    const a = tr.querySelector("a");
+    if (tds.length < 2 || !a) return null;
+    return {date: tds[0].innerText, title: a.innerText, href: a.getAttribute("href") || ""};
+}).filter(Boolean)
+"""
+
+def _inner_text(node):
+    """
+    innerText of the inline markup found in listing cells: whitespace runs
+    collapse to one space, <br> becomes a newline. Must match what
+    LISTING_ROWS_JS returns, titles are part of the dedupe key.
+    """
+    parts = []
+    for n in node.traverse(include_text=True):
+        if n.tag == "-text":
+            parts.append(n.text_content)
+        elif n.tag == "br":
+            parts.append("\0")
+    return "\n".join(
+        _INNER_WS_RE.sub(" ", seg).strip() for seg in "".join(parts).split("\0")
+    )
+
+def parse_listing_html(html):
+    """Same rows as LISTING_ROWS_JS, parsed in-process from raw HTML."""
+    raw = []
+    for tr in LexborHTMLParser(html).css("table tr"):
+        tds = tr.css("td")
+        a = tr.css_first("a")
+        if len(tds) < 2 or a is None:
+            continue
+        raw.append({
+            "date": _inner_text(tds[0]),
+            "title": _inner_text(a),
+            "href": a.attributes.get("href") or "",
+        })
+    return raw
+
+def _listing_entries(raw, base_url):
+    return [
+        {
+            "date": normalize_date(r["date"]),
+            "title": r["title"].strip(),
+            "link": urljoin(base_url, r["href"])
+        }
+        for r in raw
+    ]
+
+async def extract_listing(page, base_url):
+    raw = await page.eval_on_selector_all("table tr", LISTING_ROWS_JS)
+    return _listing_entries(raw, base_url)
+
+async def extract_listing_http(context, list_url):
+    """
+    Listing rows are in the served HTML, so fetch and parse them without
+    rendering. Returns None on a refused request or an empty table, so the
+    caller can fall back to a real page.
+    """
+    resp = await context.request.get(list_url, timeout=30000)
+    if not resp.ok:
+        logger.info("Listing HTTP %d, using browser: %s", resp.status, list_url)
+        return None
+    raw = parse_listing_html(await resp.text())
+    return _listing_entries(raw, list_url) if raw else None
+
+# PDF lookup inside the renderer: one round-trip instead of one per selector/attribute
+FIND_PDF_JS = """
+selectors => {
+    for (const sel of selectors) {
+        const el = document.querySelector(sel);
+        if (!el) continue;
+        for (const attr of ["href", "src"]) {
+            const v = el.getAttribute(attr);
+            if (v && v.toLowerCase().includes(".pdf")) return v;
+        }
+    }
+    return null;
+}
+"""
+
+async def find_pdf(page):
+    v = await page.evaluate(FIND_PDF_JS, list(PDF_SELECTORS))
+    return urljoin(page.url, v) if v else ""
+
+def find_pdf_in_html(html, base_url):
+    """Same lookup as find_pdf, on raw HTML."""
+    tree = LexborHTMLParser(html)
+    for sel in PDF_SELECTORS:
+        el = tree.css_first(sel)
         if el:
             for attr in ("href", "src"):
-                v = el.get_attribute(attr)
+                v = el.attributes.get(attr)
                 if v and ".pdf" in v.lower():
-                    return urljoin(page.url, v)
+                    return urljoin(base_url, v)
     return ""
 
-# ===================== MAIN =====================
-def main():
-    logger.info("Starting SEBI multi-section scraper")
-
-    github_sha = os.getenv("GITHUB_SHA", "")
-    master = load_master()
-    logger.info("Loaded %d existing records", len(master))
+async def find_pdf_http(context, link):
+    """
+    Fetch the detail page through the context's APIRequestContext (cookies
+    and user agent shared, no page render). Returns None if SEBI refuses
+    the plain request, so the caller can fall back to a real page.
+    """
+    resp = await context.request.get(link, timeout=DETAIL_PAGE_TIMEOUT)
+    if not resp.ok:
+        logger.info("Detail HTTP %d, using browser: %s", resp.status, link)
+        return None
+    return find_pdf_in_html(await resp.text(), resp.url)
+
+async def scrape_section(pool, list_url, category):
+    logger.info("Scraping section: %s", category)
+
+    try:
+        rows = await extract_listing_http(pool.context, list_url)
+    except Exception as ex:
+        logger.info("Listing HTTP failed, using browser [%s]: %s", category, ex)
+        rows = None
+
+    if rows is None:
+        async with pool.page() as page:
+            try:
+                await page.goto(list_url, wait_until="domcontentloaded", timeout=30000)
+            except Exception as ex:
+                logger.warning("Failed to load list page [%s]: %s", category, ex)
+                return []
 
-    existing = set()
-    for r in master:
-        title = (r.get("title") or "").lower().strip()
-        link = normalize_link(r.get("link"))
-        if title and link:
-            existing.add((title, link))
+            rows = await extract_listing(page, list_url)
 
-    new_entries = []
+    rows = rows[:NUM_ENTRIES]
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=[
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-blink-features=AutomationControlled",
-            ],
-        )
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120 Safari/537.36"
-        )
+    logger.info("Completed section: %s", category)
+    return rows
 
-        for list_url, category in SECTIONS.items():
-            logger.info("Scraping section: %s", category)
+async def fetch_detail(pool, slots, link):
+    pdf_link = ""
+    error_msg = ""
 
-            page = context.new_page()
+    async with slots:
+        for attempt in range(DETAIL_RETRIES):
             try:
-                page.goto(list_url, wait_until="domcontentloaded", timeout=30000)
+                pdf_link = await find_pdf_http(pool.context, link)
+                if pdf_link is None:
+                    async with pool.page() as detail:
+                        await detail.goto(
+                            link,
+                            wait_until="domcontentloaded",
+                            timeout=DETAIL_PAGE_TIMEOUT
+                        )
+                        pdf_link = await find_pdf(detail)
+                error_msg = ""
+                break
             except Exception as ex:
-                logger.warning("Failed to load list page [%s]: %s", category, ex)
-                page.close()
-                continue
+                pdf_link = ""
+                error_msg = f"detail_timeout: {str(ex)[:160]}"
+                if attempt + 1 < DETAIL_RETRIES:
+                    # No pause on success; back off only after a failure
+                    await asyncio.sleep(min(BACKOFF_BASE * 2 ** attempt, BACKOFF_CAP))
+
+        if error_msg:
+            logger.warning("Detail page failed: %s", link)
+
+    return pdf_link, error_msg
+
+async def new_context(browser):
+    """Context warmed with the previous run's cookies when they are available."""
+    if STATE_FILE.exists():
+        try:
+            return await browser.new_context(
+                user_agent=USER_AGENT, storage_state=str(STATE_FILE)
+            )
+        except Exception as ex:
+            logger.warning("Ignoring unreadable storage state: %s", ex)
+    return await browser.new_context(user_agent=USER_AGENT)
+
+async def save_storage_state(context):
+    try:
+        STATE_FILE.parent.mkdir(exist_ok=True)
+        await context.storage_state(path=str(STATE_FILE))
+    except Exception as ex:
+        logger.warning("Could not save storage state: %s", ex)
+
+async def scrape(existing):
+    """
+    List all sections concurrently; as each listing lands, start detail
+    fetches for its unseen entries (one fetch per dedupe key). New entries
+    are then picked in section order so dedupe stays deterministic.
+    Returns [(category, entry, pdf_link, error_msg), ...].
+    """
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
+            headless=True,
+            args=LAUNCH_ARGS,
+            ignore_default_args=IGNORE_DEFAULT_ARGS,
+        )
+        context = await new_context(browser)
+        await context.route("**/*", block_heavy_resources)
+        pool = PagePool(context)
+        slots = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+        details = {}  # dedupe key -> detail fetch task
+
+        async def list_and_fetch(url, category):
+            rows = await scrape_section(pool, url, category)
+            for e in rows:
+                key = _key(e["title"], e["link"])
+                if key not in existing and key not in details:
+                    details[key] = asyncio.create_task(
+                        fetch_detail(pool, slots, e["link"])
+                    )
+            return rows
 
-            rows = extract_listing(page, list_url)[:NUM_ENTRIES]
-            page.close()
+        listings = await asyncio.gather(
+            *(list_and_fetch(url, category) for url, category in SECTIONS.items())
+        )
 
+        results = []
+        for category, rows in zip(SECTIONS.values(), listings):
             for e in rows:
-                key = (e["title"].lower(), normalize_link(e["link"]))
+                key = _key(e["title"], e["link"])
                 if key in existing:
                     continue
 
                 logger.info("New entry found: %s", e["title"][:80])
-
-                pdf_link = ""
-                error_msg = ""
-
-                detail = context.new_page()
-                try:
-                    detail.goto(
-                        e["link"],
-                        wait_until="domcontentloaded",
-                        timeout=DETAIL_PAGE_TIMEOUT
-                    )
-                    pdf_link = find_pdf(detail)
-                except Exception as ex:
-                    error_msg = f"detail_timeout: {str(ex)[:160]}"
-                    logger.warning("Detail page failed: %s", e["link"])
-                finally:
-                    detail.close()
-                    time.sleep(DETAIL_PAGE_DELAY)
-
-                row = {
-                    "id": sha_id(e["date"], e["title"], e["link"]),
-                    "date": e["date"],
-                    "title": e["title"],
-                    "link": e["link"],
-                    "pdf_link": pdf_link,
-                    "pdf_filename": f"{category}_{safe_filename(e['title'])}",
-                    "pdf_downloaded": "no",
-                    "created_at": datetime.datetime.utcnow().isoformat() + "Z",
-                    "source_commit": github_sha,
-                    "category": category,
-                    "error": error_msg,
-                }
-
-                master.append(row)
-                new_entries.append(row)
                 existing.add(key)
+                pdf_link, error_msg = await details[key]
+                results.append((category, e, pdf_link, error_msg))
 
-            logger.info("Completed section: %s", category)
+        await save_storage_state(context)
+        await browser.close()
 
-        browser.close()
+    return results
+
+# ===================== MAIN =====================
+def main():
+    logger.info("Starting SEBI multi-section scraper")
 
-    write_master(master)
+    github_sha = os.getenv("GITHUB_SHA", "")
+    existing = load_existing_keys()
+    logger.info("Loaded %d existing records", len(existing))
 
-    with open(NEW_JSON, "w", encoding="utf-8") as f:
-        json.dump(new_entries, f, indent=2, ensure_ascii=False)
+    new_entries = []
+    results = asyncio.run(scrape(existing))
+    created_at = (
+        datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+    )
+
+    for category, e, pdf_link, error_msg in results:
+        row = {
+            "id": sha_id(e["date"], e["title"], e["link"]),
+            "date": e["date"],
+            "title": e["title"],
+            "link": e["link"],
+            "pdf_link": pdf_link,
+            "pdf_filename": f"{category}_{safe_filename(e['title'])}",
+            "pdf_downloaded": "no",
+            "created_at": created_at,
+            "source_commit": github_sha,
+            "category": category,
+            "error": error_msg,
+        }
+
+        new_entries.append(row)
+
+    append_to_master(new_entries)
+
+    write_new_json(new_entries)
 
     logger.info("SEBI scrape completed | New entries: %d", len(new_entries))
 